@@ -6,16 +6,52 @@
 # Motivation: Automating the cleanup of 'zombie' processes on shared DGX nodes.
 # ==============================================================================
 
+import argparse
 import subprocess
-import json
+import re
+import signal
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import sys
 import traceback
 import datetime
-import time
+import atexit
+import pwd
+import os
+import docker
 import psutil
+import pynvml
 
-def safe_subprocess_run(cmd, shell=True):
+# Initialize NVML once at import so every cycle reuses the same handle instead
+# of paying the ~150-300ms nvidia-smi init cost on each invocation.
+pynvml.nvmlInit()
+atexit.register(pynvml.nvmlShutdown)
+
+# Device handles are stable for the lifetime of the NVML session, so resolve
+# the count and per-index handles once rather than on every cycle.
+NVML_DEVICE_COUNT = pynvml.nvmlDeviceGetCount()
+NVML_HANDLES = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(NVML_DEVICE_COUNT)]
+
+# One Docker Engine API client for the life of the process; every call reuses
+# its keep-alive Unix-socket connection instead of forking the docker CLI.
+# Created lazily so nodes without a running dockerd still work (containers
+# are then simply reported as absent).
+_docker_client = None
+
+def get_docker_client():
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+# Hot patterns, compiled once instead of per job / per ps line.
+_SLURMSTEPD_RE = re.compile(r'slurmstepd: \[(\d+)\.batch\]')
+_IDX_RE = re.compile(r'IDX:([^)]*)\)')
+_GPU_RANGE_RE = re.compile(r'(\d+)(?:-(\d+))?')
+
+def safe_subprocess_run(cmd, shell=False):
     """Safely execute subprocess commands with error handling"""
     try:
         return subprocess.check_output(cmd, shell=shell, text=True, stderr=subprocess.PIPE)
@@ -27,115 +63,187 @@ def safe_subprocess_run(cmd, shell=True):
         print(f"Unexpected error running command {cmd}: {str(e)}")
         return ""
 
-def check_pid_belongs_to_slurm_job(pid, jobid):
-    """Check if a PID belongs to a specific SLURM job using process tree."""
-    cmd = f"""ps -ef --forest | awk -v pid={pid} -v jobid={jobid} '
-        $0 ~ "slurmstepd.*\\\\["jobid".batch\\\\]" {{print; p=NR; next}}
-        (NR>=p) && (NR<=p+4) {{
-            if ($2 == pid) found = 1;
-        }}
-        END {{
-            print "\\nPID " pid " belongs to job " jobid "?: " (found ? "TRUE" : "FALSE");
-            exit(!found)
-        }}
-    ' | grep -v "awk -v pid" """
-    
-    try:
-        result = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        return result.returncode == 0 and "TRUE" in result.stdout
-    except Exception as e:
-        return False
+def get_ps_snapshot():
+    """Capture a single ps -ef --forest snapshot as a list of lines."""
+    return safe_subprocess_run(['ps', '-ef', '--forest'], shell=False).splitlines()
+
+def build_pid_maps(ps_lines):
+    """Build pid->ppid and slurmstepd pid->jobid maps from a ps snapshot."""
+    parent = {}
+    slurmstepd_job = {}
+    for line in ps_lines[1:]:
+        fields = line.split(None, 7)
+        if len(fields) < 8:
+            continue
+        try:
+            pid, ppid = int(fields[1]), int(fields[2])
+        except ValueError:
+            continue
+        parent[pid] = ppid
+        match = _SLURMSTEPD_RE.search(fields[7])
+        if match:
+            slurmstepd_job[pid] = match.group(1)
+    return parent, slurmstepd_job
+
+def check_pid_belongs_to_slurm_job(pid, jobid, parent, slurmstepd_job, max_depth=32):
+    """Check if a PID belongs to a specific SLURM job by walking the process tree."""
+    current = pid
+    for _ in range(max_depth):
+        if slurmstepd_job.get(current) == str(jobid):
+            return True
+        if current not in parent:
+            return False
+        current = parent[current]
+    return False
 
-def get_slurm_pid_hierarchy(job_id):
-    """Get the process hierarchy for a Slurm job."""
-    cmd = f"""ps -ef --forest | awk -v jobid={job_id} '
-        $0 ~ "slurmstepd.*\\\\["jobid"\\\\.batch\\\\]" {{print; p=NR; next}}
-        (NR>=p) && (NR<=p+4) {{print}}
-    ' | grep -v "awk -v" """
-    return safe_subprocess_run(cmd)
+def get_slurm_pid_hierarchy(job_id, ps_snapshot):
+    """Get the process hierarchy for a Slurm job from a ps snapshot."""
+    needle = f'slurmstepd: [{job_id}.batch]'
+    for i, line in enumerate(ps_snapshot):
+        if needle in line:
+            return '\n'.join(ps_snapshot[i:i + 5])
+    return ""
+
+_uid_to_user = {}
 
 def get_process_user(pid):
     """Get the username of the user who owns the process."""
     try:
-        cmd = f"ps -o user= -p {pid}"
-        return subprocess.check_output(cmd.split()).decode().strip()
+        uid = os.stat(f"/proc/{pid}").st_uid
+        if uid not in _uid_to_user:
+            _uid_to_user[uid] = pwd.getpwuid(uid).pw_name
+        return _uid_to_user[uid]
     except:
         return None
-    
+
+def get_process_cmdline(pid):
+    """Get the full command line of a process from /proc."""
+    try:
+        with open(f"/proc/{pid}/cmdline") as f:
+            return f.read().replace('\0', ' ').strip()
+    except:
+        return ""
+
+@dataclass(slots=True)
+class ContainerInfo:
+    """Per-container details needed for process attribution."""
+    name: str
+    source: str
+    user: str
+    binds: tuple
+    pids: frozenset
+
+def get_container_pids(container):
+    """Get the set of host PIDs running inside a container."""
+    pids = set()
+    try:
+        top = container.top(ps_args='-eo pid')
+        pid_col = top['Titles'].index('PID')
+        for row in top['Processes'] or []:
+            try:
+                pids.add(int(row[pid_col]))
+            except (ValueError, IndexError):
+                continue
+    except Exception as e:
+        print(f"Error getting PIDs for container {container.short_id}: {str(e)}")
+    return frozenset(pids)
+
 def get_container_info():
-    """Get detailed container information using docker inspect."""
+    """Get detailed container information from the Docker Engine API."""
     containers = {}
     try:
-        container_ids = safe_subprocess_run(['docker', 'container', 'ls', '--format', '{{.ID}}'], shell=False).strip().split('\n')
-        for cid in container_ids:
-            if not cid:
-                continue
-            try:
-                inspect = safe_subprocess_run(['docker', 'inspect', cid], shell=False)
-                info = json.loads(inspect)[0]
-                containers[cid] = {
-                    'name': info['Name'],
-                    'mount_path': info['Mounts'][0]['Source'] if info['Mounts'] else '',
-                    'user': info['Mounts'][0]['Source'].split('/')[2] if info['Mounts'] else 'unknown',
-                    'binds': info['HostConfig']['Binds'] if 'Binds' in info['HostConfig'] else [],
-                    'source': info['Mounts'][0]['Source'] if info['Mounts'] else ''
-                }
-            except Exception as e:
-                print(f"Error inspecting container {cid}: {str(e)}")
+        # containers.list() already carries the full inspect payload in
+        # .attrs, so no per-container inspect round trip is needed.
+        for container in get_docker_client().containers.list():
+            info = container.attrs
+            source = info['Mounts'][0]['Source'] if info['Mounts'] else ''
+            containers[container.short_id] = ContainerInfo(
+                name=info['Name'],
+                source=source,
+                user=source.split('/')[2] if source else 'unknown',
+                binds=tuple(info['HostConfig'].get('Binds') or ()),
+                pids=get_container_pids(container)
+            )
     except Exception as e:
         print(f"Error getting container info: {str(e)}")
     return containers
 
+def get_scontrol_records():
+    """Fetch all scontrol job records in one call, parsed into key=value dicts."""
+    records = {}
+    try:
+        output = safe_subprocess_run(['scontrol', '-o', 'show', 'job', '-dd', '--all'], shell=False)
+        for line in output.strip().split('\n'):
+            if 'JobId=' not in line:
+                continue
+            fields = {'_raw': line}
+            for token in line.split():
+                if '=' in token:
+                    key, _, value = token.partition('=')
+                    fields.setdefault(key, value)
+            records[fields['JobId']] = fields
+            # squeue reports running array tasks as <base>_<index>, while
+            # scontrol emits them under their raw JobId, so index those
+            # records under the array notation too.
+            if 'ArrayJobId' in fields and 'ArrayTaskId' in fields:
+                records[f"{fields['ArrayJobId']}_{fields['ArrayTaskId']}"] = fields
+    except Exception as e:
+        print(f"Error fetching scontrol records: {str(e)}")
+    return records
+
+def parse_gpu_indices(record):
+    """Extract allocated GPU indices from the IDX:... part of a job record."""
+    gpu_indices = []
+    idx_match = _IDX_RE.search(record.get('_raw', ''))
+    if idx_match:
+        for part in idx_match.group(1).split(','):
+            range_match = _GPU_RANGE_RE.fullmatch(part)
+            if not range_match:
+                continue
+            start = int(range_match.group(1))
+            end = int(range_match.group(2)) if range_match.group(2) else start
+            gpu_indices.extend(range(start, end + 1))
+    return gpu_indices
+
+def format_runtime(runtime):
+    """Format scontrol RunTime (D-HH:MM:SS or HH:MM:SS) as a readable string."""
+    if not runtime:
+        return ""
+    try:
+        days = 0
+        if '-' in runtime:
+            day_part, runtime = runtime.split('-')
+            days = int(day_part)
+        hours, mins, secs = (int(p) for p in runtime.split(':'))
+        delta = datetime.timedelta(days=days, hours=hours, minutes=mins, seconds=secs)
+        hours, rem = divmod(delta.seconds, 3600)
+        mins, secs = divmod(rem, 60)
+        if delta.days:
+            return f"{delta.days} days, {hours} hours, {mins} minutes, {secs} seconds"
+        return f"{hours} hours, {mins} minutes, {secs} seconds"
+    except ValueError:
+        return runtime
+
 def get_slurm_jobs():
     """Get information about running SLURM jobs."""
     slurm_jobs = {}
     try:
-        jobs = safe_subprocess_run("squeue -h -o '%i %u %j %T %R'", shell=True).strip().split('\n')
-        
+        jobs = safe_subprocess_run(['squeue', '-h', '-o', '%i %u %j %T %R'], shell=False).strip().split('\n')
+        scontrol_records = get_scontrol_records()
+
         for job in jobs:
             try:
                 job_id, user, job_name, state, node_list = job.split()
-                scontrol_out = safe_subprocess_run(f"scontrol show job {job_id} -dd")
-                
-                # Extract GPU indices
-                gpu_indices = []
-                if 'IDX:' in scontrol_out:
-                    idx_part = scontrol_out.split('IDX:')[1].split(')')[0]
-                    for part in idx_part.split(','):
-                        if '-' in part:
-                            start, end = map(int, part.split('-'))
-                            gpu_indices.extend(range(start, end + 1))
-                        else:
-                            try:
-                                gpu_indices.append(int(part))
-                            except ValueError:
-                                continue
-                
-                # Extract WorkDir
-                workdir = ""
-                if 'WorkDir=' in scontrol_out:
-                    workdir = scontrol_out.split('WorkDir=')[1].split()[0]
-                
-                # Extract RunTime
-                runtime = ""
-                if 'RunTime=' in scontrol_out:
-                    runtime = scontrol_out.split('RunTime=')[1].split()[0]
-                    if '-' in runtime:
-                        days, time = runtime.split('-')
-                        hours, mins, secs = time.split(':')
-                        runtime = f"{days} days, {hours} hours, {mins} minutes, {secs} seconds"
-                    else:
-                        hours, mins, secs = runtime.split(':')
-                        runtime = f"{hours} hours, {mins} minutes, {secs} seconds"
-                
+                record = scontrol_records.get(job_id, {})
+
                 slurm_jobs[job_id] = {
                     'user': user,
                     'job_name': job_name,
                     'state': state,
                     'node_list': node_list,
-                    'gpu_indices': gpu_indices,
-                    'workdir': workdir,
-                    'runtime': runtime
+                    'gpu_indices': frozenset(parse_gpu_indices(record)),
+                    'workdir': record.get('WorkDir', ''),
+                    'runtime': format_runtime(record.get('RunTime', ''))
                 }
             except Exception as e:
                 print(f"Error processing job {job}: {str(e)}")
@@ -146,25 +254,19 @@ def get_slurm_jobs():
     return slurm_jobs
 
 def get_gpu_processes():
-    """Get detailed information about processes using GPUs."""
+    """Get detailed information about processes using GPUs via NVML."""
     gpu_processes = defaultdict(list)
     try:
-        smi_output = safe_subprocess_run(['nvidia-smi', '--query-compute-apps=gpu_uuid,pid,used_memory', '--format=csv,noheader,nounits'], shell=False)
-        gpu_info = safe_subprocess_run(['nvidia-smi', '-L'], shell=False).strip().split('\n')
-        
-        for line in smi_output.strip().split('\n'):
-            if line:
-                gpu_uuid, pid, memory = line.split(', ')
-                for idx, info in enumerate(gpu_info):
-                    if gpu_uuid in info:
-                        gpu_processes[idx].append((int(pid), memory))
-                        break
+        for idx, handle in enumerate(NVML_HANDLES):
+            for proc in pynvml.nvmlDeviceGetComputeRunningProcesses_v3(handle):
+                memory = proc.usedGpuMemory // (1024 * 1024) if proc.usedGpuMemory else 0
+                gpu_processes[idx].append((proc.pid, memory))
     except Exception as e:
         print(f"Error getting GPU process information: {str(e)}")
-    
+
     return gpu_processes
 
-def kill_non_slurm_process(pid, process_info):
+def kill_non_slurm_process(pid, process_info, log_fh):
     """Safely kill non-SLURM processes with logging"""
     try:
         current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -189,144 +291,192 @@ PID {pid} (Live GPU Memory: {process_info['memory']} MiB):
 Killed PID {pid} successfully (Non-SLURM process)
 ----------------------------------------\n"""
 
-        # Try graceful termination
+        # Try graceful termination, waiting only as long as the process
+        # actually takes to exit (up to 5s) before escalating.
         subprocess.run(['sudo', 'kill', str(pid)], check=True)
-        time.sleep(5)
-        
-        # Force kill if still running
-        if psutil.pid_exists(pid):
+        try:
+            psutil.Process(pid).wait(timeout=5)
+        except psutil.TimeoutExpired:
             subprocess.run(['sudo', 'kill', '-9', str(pid)], check=True)
             log_message += "Force kill was required\n"
-            
-        with open('gpu_kills.log', 'a') as f:
-            f.write(log_message)
-            
+        except psutil.NoSuchProcess:
+            pass
+
+        log_fh.write(log_message)
+
         print(f"Successfully terminated PID {pid} - See gpu_kills.log for details")
-        
+
     except Exception as e:
         error_msg = f"Error killing PID {pid}: {str(e)}\n"
         print(error_msg)
-        with open('gpu_kills.log', 'a') as f:
-            f.write(error_msg)
+        log_fh.write(error_msg)
 
 
 def analyze_gpu_usage():
     """Main function to analyze and display GPU usage."""
+    # One buffered handle for the whole run instead of reopening the log
+    # for every kill.
+    log_fh = open('gpu_kills.log', 'a', buffering=8192)
     try:
         print("\nCollecting system information...")
-        slurm_info = get_slurm_jobs()
-        containers = get_container_info()
-        gpu_processes = get_gpu_processes()
-        
+        # The collectors are independent and dominated by subprocess waits,
+        # so overlap them with threads.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            slurm_future = executor.submit(get_slurm_jobs)
+            containers_future = executor.submit(get_container_info)
+            gpu_future = executor.submit(get_gpu_processes)
+            ps_future = executor.submit(get_ps_snapshot)
+            slurm_info = slurm_future.result()
+            containers = containers_future.result()
+            gpu_processes = gpu_future.result()
+            ps_snapshot = ps_future.result()
+        parent, slurmstepd_job = build_pid_maps(ps_snapshot)
+
+        # Per-PID command/user, looked up once per cycle.
+        proc_cache = {}
+
+        def get_proc_info(pid):
+            if pid not in proc_cache:
+                proc_cache[pid] = (get_process_cmdline(pid), get_process_user(pid))
+            return proc_cache[pid]
+
+        # Invert job->GPUs once so the per-GPU loop does a single dict lookup
+        # instead of filtering every job again.
+        jobs_by_gpu = defaultdict(dict)
+        for job_id, job_info in slurm_info.items():
+            for gpu_id in job_info['gpu_indices']:
+                jobs_by_gpu[gpu_id][job_id] = job_info
+
         print("\nGPU Usage Analysis:")
         print("=" * 80)
         
         # Get total number of GPUs in system
-        total_gpus = len(safe_subprocess_run(['nvidia-smi', '-L'], shell=False).strip().split('\n'))
-        
-        # Iterate through all possible GPU indices
-        for gpu_id in range(total_gpus):
-            print(f"\nGPU {gpu_id}:")
-            print("-" * 40)
-            
+        total_gpus = NVML_DEVICE_COUNT
+
+        def process_gpu(gpu_id):
+            # Buffer the report per GPU so concurrent workers don't
+            # interleave output; the buffers are printed in GPU order.
+            out = [f"\nGPU {gpu_id}:", "-" * 40]
+
             # Get SLURM jobs for this specific GPU
-            gpu_specific_jobs = {
-                job_id: job_info 
-                for job_id, job_info in slurm_info.items() 
-                if gpu_id in job_info['gpu_indices']
-            }
-            
+            gpu_specific_jobs = jobs_by_gpu.get(gpu_id, {})
+
             # Display GPU process information if exists
-            if gpu_id in gpu_processes:
-                for pid, memory in gpu_processes[gpu_id]:
-                    try:
-                        # Check if process is in container
-                        container_info = None
-                        for cid, info in containers.items():
-                            try:
-                                if str(pid) in safe_subprocess_run(['docker', 'top', cid], shell=False):
-                                    container_info = info
+            for pid, memory in gpu_processes.get(gpu_id, ()):
+                try:
+                    # Check if process is in container
+                    container_info = next(
+                        (info for info in containers.values() if pid in info.pids),
+                        None
+                    )
+
+                    process_type = "Container" if container_info else "Bare Metal"
+                    cmd, proc_user = get_proc_info(pid)
+
+                    # Check if process belongs to any SLURM job
+                    slurm_job_id = None
+                    for job_id, job_info in gpu_specific_jobs.items():
+                        if check_pid_belongs_to_slurm_job(pid, job_id, parent, slurmstepd_job):
+                            if container_info:
+                                # Container process - check user match
+                                if container_info.user == job_info['user']:
+                                    slurm_job_id = job_id
+                                    break
+                            else:
+                                # Bare metal process - check process user match
+                                if proc_user == job_info['user']:
+                                    slurm_job_id = job_id
                                     break
-                            except:
-                                continue
-                        
-                        process_type = "Container" if container_info else "Bare Metal"
-                        
-                        # Check if process belongs to any SLURM job
-                        slurm_job_id = None
-                        for job_id, job_info in gpu_specific_jobs.items():
-                            if check_pid_belongs_to_slurm_job(pid, job_id):
-                                if container_info:
-                                    # Container process - check user match
-                                    if container_info['user'] == job_info['user']:
-                                        slurm_job_id = job_id
-                                        break
-                                else:
-                                    # Bare metal process - check process user match
-                                    if get_process_user(pid) == job_info['user']:
-                                        slurm_job_id = job_id
-                                        break
-                        
-                        slurm_status = f"SLURM & belongs to Jobid {slurm_job_id}" if slurm_job_id else "Non-SLURM"
-                        cmd = safe_subprocess_run(['ps', '-p', str(pid), '-o', 'cmd='], shell=False).strip()
-                        if slurm_status == "Non-SLURM":
-                            kill_non_slurm_process(pid, {
-                                'memory': memory,
-                                'type': process_type,
-                                'user': get_process_user(pid) if not container_info else container_info['user'],
-                                'command': cmd,
-                                'container_name': container_info['name'] if container_info else None,
-                                'mount_source': container_info['source'] if container_info else None,
-                                'container_binds': ', '.join(container_info['binds']) if container_info and container_info['binds'] else None
-                            })
-                        
-                        print(f"PID {pid} (Live GPU Memory: {memory} MiB):")
-                        print(f"  - Execution Type: {process_type}")
-                        print(f"  - Resource Management: {slurm_status}")
-                        print(f"  - Live GPU Memory Usage: {memory} MiB")
-                        
-                        if container_info:
-                            print(f"  - Container Name: {container_info['name']}")
-                            print(f"  - Container User: {container_info['user']}")
-                            print(f"  - Mount Source: {container_info['source']}")
-                            if container_info['binds']:
-                                print(f"  - Container Binds: {', '.join(container_info['binds'])}")
-                        else:
-                            print(f"  - User: {get_process_user(pid)}")
-                        
-                        cmd = safe_subprocess_run(['ps', '-p', str(pid), '-o', 'cmd='], shell=False).strip()
-                        if cmd:
-                            print(f"  - Command: {cmd}")
-                        else:
-                            print("  - Command: Unknown")
-                        print()
-                        
-                    except Exception as e:
-                        print(f"Error processing PID {pid}: {str(e)}")
-                        continue
-            
+
+                    slurm_status = f"SLURM & belongs to Jobid {slurm_job_id}" if slurm_job_id else "Non-SLURM"
+                    if slurm_status == "Non-SLURM":
+                        kill_non_slurm_process(pid, {
+                            'memory': memory,
+                            'type': process_type,
+                            'user': proc_user if not container_info else container_info.user,
+                            'command': cmd,
+                            'container_name': container_info.name if container_info else None,
+                            'mount_source': container_info.source if container_info else None,
+                            'container_binds': ', '.join(container_info.binds) if container_info and container_info.binds else None
+                        }, log_fh)
+
+                    out.append(f"PID {pid} (Live GPU Memory: {memory} MiB):")
+                    out.append(f"  - Execution Type: {process_type}")
+                    out.append(f"  - Resource Management: {slurm_status}")
+                    out.append(f"  - Live GPU Memory Usage: {memory} MiB")
+
+                    if container_info:
+                        out.append(f"  - Container Name: {container_info.name}")
+                        out.append(f"  - Container User: {container_info.user}")
+                        out.append(f"  - Mount Source: {container_info.source}")
+                        if container_info.binds:
+                            out.append(f"  - Container Binds: {', '.join(container_info.binds)}")
+                    else:
+                        out.append(f"  - User: {proc_user}")
+
+                    if cmd:
+                        out.append(f"  - Command: {cmd}")
+                    else:
+                        out.append("  - Command: Unknown")
+                    out.append("")
+
+                except Exception as e:
+                    out.append(f"Error processing PID {pid}: {str(e)}")
+                    continue
+
             # Display SLURM job information for this GPU
             for job_id, job_info in gpu_specific_jobs.items():
-                print(f"\nSLURM Job ID: {job_id}")
-                print(f"  - User: {job_info['user']}")
-                print(f"  - Job Name: {job_info['job_name']}")
-                print(f"  - State: {job_info['state']}")
-                print(f"  - Node List: {job_info['node_list']}")
-                print(f"  - Working Directory: {job_info['workdir']}")
-                print(f"  - Running Time: {job_info['runtime']}")
-                print(f"  - Slurm PID Hierarchy:")
-                hierarchy = get_slurm_pid_hierarchy(job_id)
+                out.append(f"\nSLURM Job ID: {job_id}")
+                out.append(f"  - User: {job_info['user']}")
+                out.append(f"  - Job Name: {job_info['job_name']}")
+                out.append(f"  - State: {job_info['state']}")
+                out.append(f"  - Node List: {job_info['node_list']}")
+                out.append(f"  - Working Directory: {job_info['workdir']}")
+                out.append(f"  - Running Time: {job_info['runtime']}")
+                out.append(f"  - Slurm PID Hierarchy:")
+                hierarchy = get_slurm_pid_hierarchy(job_id, ps_snapshot)
                 for line in hierarchy.splitlines():
-                    print(f"    {line}")
-    
+                    out.append(f"    {line}")
+            return out
+
+        # Fan the per-GPU work out to threads so kill waits and hierarchy
+        # lookups on different GPUs overlap instead of running back to back.
+        with ThreadPoolExecutor(max_workers=max(1, min(8, total_gpus))) as executor:
+            for lines in executor.map(process_gpu, range(total_gpus)):
+                print('\n'.join(lines))
+
     except Exception as e:
         print(f"Fatal error in analyze_gpu_usage: {str(e)}")
         traceback.print_exc()
+    finally:
+        log_fh.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor GPUs and terminate non-SLURM processes.")
+    parser.add_argument('--interval', type=int, default=60,
+                        help='seconds between polling cycles (default: 60)')
+    parser.add_argument('--once', action='store_true',
+                        help='run a single cycle and exit')
+    args = parser.parse_args()
+
+    # Running as a long-lived daemon keeps NVML (and any other per-process
+    # state) alive across cycles instead of paying the init cost every run.
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: shutdown.set())
 
-if __name__ == "__main__":
     try:
-        analyze_gpu_usage()
+        while True:
+            analyze_gpu_usage()
+            # stdout is block-buffered when redirected to the status log;
+            # flush so each cycle's report lands as soon as it completes.
+            sys.stdout.flush()
+            if args.once or shutdown.wait(args.interval):
+                break
     except Exception as e:
         print(f"Script execution failed: {str(e)}")
         traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file